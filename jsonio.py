@@ -0,0 +1,80 @@
+"""
+JSON helpers shared by the tg2kb scripts.
+
+Uses orjson when it is installed and falls back to the standard library
+json module otherwise. Both paths work with bytes and encode datetimes as
+ISO 8601 strings, with UTC (and naive) values written as "...Z".
+"""
+
+import json
+from datetime import datetime, timedelta
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Datetimes are encoded natively by orjson, matching _default() below
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z if orjson is not None else 0
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# catch this regardless of the backend in use
+JSONDecodeError = json.JSONDecodeError
+
+
+def format_datetime(value: datetime) -> str:
+    """
+    Format a datetime the way dumps() writes it.
+    
+    Args:
+        value: Datetime to format
+        
+    Returns:
+        ISO 8601 string, ending in "Z" for UTC and naive values
+    """
+    if value.tzinfo is None or value.utcoffset() == timedelta(0):
+        return value.replace(tzinfo=None).isoformat() + 'Z'
+    return value.isoformat()
+
+
+def _default(obj: Any) -> Any:
+    """
+    Serialize values the stdlib json encoder does not handle natively.
+    """
+    if isinstance(obj, datetime):
+        return format_datetime(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def loads(data: Any) -> Any:
+    """
+    Parse JSON from bytes or str.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize obj to UTF-8 encoded JSON bytes.
+    
+    Args:
+        obj: Value to serialize
+        indent: Pretty-print with two-space indentation
+        
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        option = (_ORJSON_OPTIONS | orjson.OPT_INDENT_2) if indent else _ORJSON_OPTIONS
+        return orjson.dumps(obj, option=option)
+    # Without indentation, match orjson's compact separators as well
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        separators=None if indent else (',', ':'),
+        ensure_ascii=False,
+        default=_default
+    ).encode('utf-8')
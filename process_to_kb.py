@@ -1,18 +1,185 @@
 import os
+import sys
+import glob
 import json
+import time
+import shelve
+import hashlib
+import asyncio
+import argparse
+import re
+from datetime import datetime
 from pathlib import Path
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, RateLimitError, APIConnectionError, InternalServerError
 from dotenv import load_dotenv
 
+import jsonio
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 load_dotenv()
 
 EXAMPLES_DIR = Path('examples')
 OUTPUTS_DIR = Path('outputs')
 OUTPUT_FILE = OUTPUTS_DIR / 'notes.json'
+# Telegram dumps written by tg_client.py
+DUMP_SUFFIXES = {'.json', '.msgpack'}
+DEFAULT_CONCURRENCY = 16
+DEFAULT_CACHE_DIR = Path('.cache') / 'tg2kb'
+# Maximum number of batches / result groups waiting between pipeline stages
+QUEUE_SIZE = 256
+# Dumps smaller than this are cheaper to parse in one go than to stream
+STREAMING_THRESHOLD_BYTES = 8 * 1024 * 1024
+# Pre-filtered SKIP entries are sent to the writer in groups of at most this size
+SKIPPED_FLUSH_SIZE = 1000
+# Posts below these thresholds are answered with SKIP without calling the API
+MIN_INFORMATIVE_CHARS = 40
+MIN_INFORMATIVE_WORDS = 3
+
+# Russian Zettelkasten instructions, sent as a static system message so the
+# prefix is identical across requests and eligible for OpenAI prompt caching.
+# The user message only carries the numbered posts (ID, date and text).
+SYSTEM_PROMPT = """
+Тебе присылают пронумерованные посты из Telegram. Преврати каждый пост в Zettelkasten-заметку, только если он информативный (то есть содержит идею, действие или факт). Если он слишком короткий, водянистый или бессмысленный — вместо заметки верни просто `SKIP`.
+
+Используй формат заметки:
+
+---
+## Zettel: {{гггг-мм-дд}}-{{id}}
+### Название: {{1–2 слова, отражающие суть}}
+**Теги**: #тег1 #тег2  
+**Дата**: {{дата поста}}  
+**Источник**: ID {{id}}
+
+{{Краткое содержание на 1–3 предложения. Без воды.}}
+---
+
+Ответь JSON-объектом вида {"notes": [{"id": <ID поста>, "zettel": "<заметка или SKIP>"}]} — ровно один элемент на каждый пост.
+"""
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+URL_RE = re.compile(r'\s*(?:https?://|www\.)\S+\s*', re.IGNORECASE)
+MODEL = "gpt-4o"
+MAX_TOKENS = 200
+MAX_CONTEXT_TOKENS = 128000
+DEFAULT_BATCH_SIZE = 10
+MAX_ATTEMPTS = 5
+# Defaults match the gpt-4o tier 1 limits; override with TG2KB_RPM / TG2KB_TPM
+DEFAULT_RPM = 500
+DEFAULT_TPM = 30000
+# One keep-alive HTTP/2 pool shared by every request
+MAX_CONNECTIONS = 64
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+
+class RateLimiter:
+    """
+    Token-bucket throttle for requests and tokens per minute.
+
+    Callers wait here before each request, so the client paces itself below
+    the account limits instead of running into 429 responses.
+    """
+
+    def __init__(self, max_requests_per_minute: int, max_tokens_per_minute: int):
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.available_request_capacity = float(max_requests_per_minute)
+        self.available_token_capacity = float(max_tokens_per_minute)
+        self.last_update_time = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_update_time
+        self.available_request_capacity = min(
+            self.available_request_capacity + self.max_requests_per_minute * elapsed / 60.0,
+            self.max_requests_per_minute,
+        )
+        self.available_token_capacity = min(
+            self.available_token_capacity + self.max_tokens_per_minute * elapsed / 60.0,
+            self.max_tokens_per_minute,
+        )
+        self.last_update_time = now
 
+    async def acquire(self, tokens: int):
+        # A single request larger than the whole bucket would otherwise wait forever
+        tokens = min(tokens, self.max_tokens_per_minute)
+        while True:
+            self._refill()
+            if self.available_request_capacity >= 1 and self.available_token_capacity >= tokens:
+                self.available_request_capacity -= 1
+                self.available_token_capacity -= tokens
+                return
+            await asyncio.sleep(0.001)
 
-def list_json_files(directory: Path):
-    return [f for f in directory.glob('*.json') if f.is_file()]
+
+class ResponseCache:
+    """
+    On-disk cache of completions keyed by sha256(model + prompt).
+
+    Summaries of the same post are stable, so reruns over the same dump can
+    reuse earlier answers instead of paying for them again.
+    """
+
+    def __init__(self, cache_dir: Path):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self._db = shelve.open(str(cache_dir / 'responses'))
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\n{prompt}".encode('utf-8')).hexdigest()
+
+    def get(self, key: str):
+        content = self._db.get(key)
+        if content is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return content
+
+    def set(self, key: str, content: str):
+        self._db[key] = content
+
+    def close(self):
+        self._db.close()
+
+
+def rate_limiter_from_env():
+    rpm = int(os.getenv('TG2KB_RPM', DEFAULT_RPM))
+    tpm = int(os.getenv('TG2KB_TPM', DEFAULT_TPM))
+    return RateLimiter(rpm, tpm)
+
+
+def estimate_tokens(prompt: str, max_tokens: int = MAX_TOKENS) -> int:
+    # Rough heuristic: ~4 characters per token plus the completion budget
+    return len(prompt) // 4 + max_tokens
+
+
+def list_dump_files(directory: Path):
+    return sorted(f for f in directory.iterdir() if f.suffix in DUMP_SUFFIXES and f.is_file())
+
+
+def resolve_inputs(patterns):
+    files = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        if not matches:
+            print(f"No files match {pattern}")
+        for match in matches:
+            path = Path(match)
+            if path.is_file() and path not in files:
+                files.append(path)
+    return files
 
 
 def select_file(files):
@@ -30,82 +197,314 @@ def select_file(files):
             print("Please enter a valid number.")
 
 
-def load_messages(file_path: Path):
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return data.get('messages', [])
+def iter_messages(file_path: Path):
+    if file_path.suffix == '.msgpack':
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed; run 'pip install msgpack'")
+        data = msgpack.unpackb(file_path.read_bytes(), timestamp=3)
+        for msg in data.get('messages', []):
+            # Dates come back as datetimes; format them as in JSON dumps so
+            # the prompt, and with it the cache key, match across formats
+            if isinstance(msg.get('date'), datetime):
+                msg['date'] = jsonio.format_datetime(msg['date'])
+            yield msg
+        return
+    if ijson is None or file_path.stat().st_size < STREAMING_THRESHOLD_BYTES:
+        data = jsonio.loads(file_path.read_bytes())
+        yield from data.get('messages', [])
+        return
+    with open(file_path, 'rb') as f:
+        yield from ijson.items(f, 'messages.item', use_float=True)
 
 
-def process_message_with_openai(msg, client):
-    # Russian Zettelkasten prompt with ID, date, and text
-    escaped_text = msg.get('text', '').replace('"', '\"')
-    prompt = f"""
-Преврати следующий пост из Telegram в Zettelkasten-заметку, только если он информативный (то есть содержит идею, действие или факт). Если он слишком короткий, водянистый или бессмысленный — верни просто `SKIP`.
+def is_informative(text: str) -> bool:
+    stripped = text.strip()
+    if len(stripped) < MIN_INFORMATIVE_CHARS:
+        return False
+    if URL_RE.fullmatch(stripped):
+        return False
+    unique_words = {word.lower() for word in WORD_RE.findall(stripped)}
+    return len(unique_words) >= MIN_INFORMATIVE_WORDS
 
-Используй формат вывода:
 
----
-## Zettel: {{{{гггг-мм-дд}}}}-{{{{id}}}}
-### Название: {{{{1–2 слова, отражающие суть}}}}
-**Теги**: #тег1 #тег2  
-**Дата**: {{{{дата поста}}}}  
-**Источник**: ID {{{{id}}}}
+def render_post(msg):
+    # json.dumps quotes and escapes the text so it cannot break out of the field
+    text = json.dumps(msg.get('text', ''), ensure_ascii=False)
+    return f"ID: {msg.get('id')}\nДата: {msg.get('date')}\nТекст: {text}"
 
-{{{{Краткое содержание на 1–3 предложения. Без воды.}}}}
----
 
-Пост:
-ID: {msg.get('id')}
-Дата: {msg.get('date')}
-Текст: "{escaped_text}"
-"""
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=200
-        )
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        return f"[OpenAI error: {e}]"
+def iter_batches(messages, batch_size):
+    # Group messages so each request stays within both batch_size and the context window.
+    # None entries are passed straight through without closing the current batch
+    batch = []
+    batch_tokens = 0
+    for msg in messages:
+        if msg is None:
+            yield None
+            continue
+        msg_tokens = len(render_post(msg)) // 4 + MAX_TOKENS
+        if batch and (len(batch) >= batch_size or batch_tokens + msg_tokens > MAX_CONTEXT_TOKENS):
+            yield batch
+            batch = []
+            batch_tokens = 0
+        batch.append(msg)
+        batch_tokens += msg_tokens
+    if batch:
+        yield batch
 
 
-def main():
-    files = list_json_files(EXAMPLES_DIR)
-    if not files:
-        print("No JSON files found in examples folder.")
-        return
-    selected_file = select_file(files)
-    print(f"\nProcessing file: {selected_file.name}")
-    messages = load_messages(selected_file)
-    if not messages:
-        print("No messages found in the selected file.")
+def parse_batch_response(content, msgs):
+    notes = jsonio.loads(content).get('notes', [])
+    by_id = {str(note.get('id')): note.get('zettel') for note in notes if isinstance(note, dict)}
+    summaries = []
+    for msg in msgs:
+        zettel = by_id.get(str(msg.get('id')))
+        summaries.append(zettel.strip() if isinstance(zettel, str) else "[OpenAI error: no note returned for this post]")
+    return summaries
+
+
+async def process_batch(msgs, client, rate_limiter=None, cache=None):
+    posts = [render_post(msg) for msg in msgs]
+    summaries = [None] * len(msgs)
+    cache_keys = [None] * len(msgs)
+    if cache is not None:
+        for i, post in enumerate(posts):
+            cache_keys[i] = cache.make_key(MODEL, f"{SYSTEM_PROMPT}\n{post}")
+            summaries[i] = cache.get(cache_keys[i])
+    pending = [i for i, summary in enumerate(summaries) if summary is None]
+    if not pending:
+        return summaries
+    prompt = "\n\n".join(f"Пост {n}:\n{posts[i]}" for n, i in enumerate(pending, 1))
+    max_tokens = MAX_TOKENS * len(pending)
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        if rate_limiter is not None:
+            await rate_limiter.acquire(estimate_tokens(SYSTEM_PROMPT + prompt, max_tokens))
+        try:
+            response = await client.chat.completions.create(
+                model=MODEL,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"}
+            )
+            contents = parse_batch_response(response.choices[0].message.content, [msgs[i] for i in pending])
+            break
+        except (RateLimitError, APIConnectionError, InternalServerError) as e:
+            # Safety net only: the rate limiter should keep us below the limits
+            if attempt == MAX_ATTEMPTS:
+                contents = [f"[OpenAI error: {e}]"] * len(pending)
+                break
+            await asyncio.sleep(2 ** attempt)
+        except Exception as e:
+            contents = [f"[OpenAI error: {e}]"] * len(pending)
+            break
+    for i, content in zip(pending, contents):
+        summaries[i] = content
+        if cache is not None and not content.startswith("[OpenAI error:"):
+            cache.set(cache_keys[i], content)
+    return summaries
+
+
+def load_done_ids(results_file: Path):
+    # IDs with a usable summary from an earlier run; failed ones are retried
+    done_ids = set()
+    if not results_file.exists():
+        return done_ids
+    with open(results_file, 'rb') as f:
+        for line in f:
+            try:
+                entry = jsonio.loads(line)
+            except jsonio.JSONDecodeError:
+                continue  # Partially written line from an interrupted run
+            if not str(entry.get('summary', '')).startswith("[OpenAI error:"):
+                done_ids.add(entry.get('id'))
+    return done_ids
+
+
+def append_result(out, msg_id, summary):
+    out.write(jsonio.dumps({'id': msg_id, 'summary': summary}) + b'\n')
+    out.flush()
+
+
+def write_notes_json(results_file: Path, output_file: Path, dump_order):
+    # Later lines win, so retried messages replace their earlier errors
+    processed = {}
+    with open(results_file, 'rb') as f:
+        for line in f:
+            try:
+                entry = jsonio.loads(line)
+            except jsonio.JSONDecodeError:
+                continue
+            processed[entry.get('id')] = entry
+    # The JSONL is in completion order; write the notes in dump order instead
+    entries = sorted(processed.values(), key=lambda entry: dump_order.get(entry.get('id'), len(dump_order)))
+    output_file.write_bytes(jsonio.dumps(entries, indent=True))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Turn a Telegram dump into Zettelkasten notes via OpenAI.")
+    parser.add_argument('--input', action='append', metavar='PATH',
+                        help="Dump file or glob pattern to process; may be repeated. "
+                             "Without it, a file from examples/ is chosen interactively")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Maximum number of OpenAI requests in flight (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Number of posts sent in a single OpenAI request (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always call OpenAI, ignoring cached responses")
+    parser.add_argument('--cache-dir', type=Path, default=DEFAULT_CACHE_DIR,
+                        help=f"Directory for cached OpenAI responses (default: {DEFAULT_CACHE_DIR})")
+    return parser.parse_args()
+
+
+def output_file_for(selected_file: Path):
+    # Create output file name based on input file
+    input_stem = selected_file.stem.replace('raw_dump_', '')
+    return OUTPUTS_DIR / f'notes_{input_stem}.json'
+
+
+async def process_file(selected_file: Path, client, rate_limiter, cache, api_slots, concurrency, batch_size):
+    # Pipeline: parse -> q_in -> API workers -> q_out -> JSONL writer.
+    # The bounded queues keep memory flat and let every stage run at once.
+    # api_slots is shared by all files, so --concurrency caps the whole run
+    workers = max(1, concurrency)
+    q_in = asyncio.Queue(maxsize=QUEUE_SIZE)
+    q_out = asyncio.Queue(maxsize=QUEUE_SIZE)
+    # Ensure output directory exists
+    OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
+    output_file = output_file_for(selected_file)
+    results_file = output_file.with_suffix('.jsonl')
+    done_ids = load_done_ids(results_file)
+    if done_ids:
+        print(f"Resuming: {len(done_ids)} messages already summarised in {results_file}")
+    message_count = 0
+    # Position of each message ID in the dump, for ordering the final notes
+    dump_order = {}
+    done = 0
+
+    async def producer():
+        skipped = []
+
+        def informative_messages():
+            nonlocal message_count
+            for msg in iter_messages(selected_file):
+                dump_order.setdefault(msg.get('id'), message_count)
+                message_count += 1
+                text = msg.get('text', '')
+                if not text or msg.get('id') in done_ids:
+                    continue
+                if is_informative(text):
+                    yield msg
+                else:
+                    # Obvious SKIPs never reach the API
+                    skipped.append((msg.get('id'), 'SKIP'))
+                    if len(skipped) >= SKIPPED_FLUSH_SIZE:
+                        # Hand control back so a long run of SKIPs is flushed
+                        yield None
+
+        for batch in iter_batches(informative_messages(), max(1, batch_size)):
+            if skipped:
+                await q_out.put(skipped)
+                skipped = []
+            if batch is not None:
+                await q_in.put(batch)
+        if skipped:
+            await q_out.put(skipped)
+        for _ in range(workers):
+            await q_in.put(None)
+
+    async def worker():
+        nonlocal done
+        while (batch := await q_in.get()) is not None:
+            try:
+                async with api_slots:
+                    summaries = await process_batch(batch, client, rate_limiter, cache)
+            except Exception as e:
+                summaries = [f"[OpenAI error: {e}]"] * len(batch)
+            await q_out.put([(msg.get('id'), summary) for msg, summary in zip(batch, summaries)])
+            done += len(batch)
+            print(f"[{done}] Done")
+        await q_out.put(None)
+
+    async def writer():
+        finished_workers = 0
+        with open(results_file, 'ab') as out:
+            while finished_workers < workers:
+                entries = await q_out.get()
+                if entries is None:
+                    finished_workers += 1
+                    continue
+                for msg_id, summary in entries:
+                    append_result(out, msg_id, summary)
+
+    await asyncio.gather(producer(), *(worker() for _ in range(workers)), writer())
+    if not message_count:
+        print(f"No messages found in {selected_file.name}.")
+        return None
+    write_notes_json(results_file, output_file, dump_order)
+    return output_file
+
+
+async def main():
+    args = parse_args()
+    if args.input:
+        selected_files = resolve_inputs(args.input)
+        if not selected_files:
+            return
+    elif sys.stdin.isatty():
+        files = list_dump_files(EXAMPLES_DIR)
+        if not files:
+            print("No dump files found in examples folder.")
+            return
+        selected_files = [select_file(files)]
+    else:
+        print("No --input given and stdin is not interactive.")
         return
+    # Files that map to the same notes file would race on its JSONL and pay
+    # for every post twice
+    sources = {}
+    for path in selected_files:
+        output_file = output_file_for(path)
+        if output_file in sources:
+            print(f"{sources[output_file]} and {path} would both write {output_file}; "
+                  f"process them in separate runs.")
+            return
+        sources[output_file] = path
+    print(f"\nProcessing files: {', '.join(f.name for f in selected_files)}")
     openai_api_key = os.getenv('OPENAI_API_KEY')
     if not openai_api_key:
         print("OPENAI_API_KEY not set in environment.")
         return
-    client = OpenAI(api_key=openai_api_key)
-    print(f"\nProcessing {len(messages)} messages through OpenAI GPT-4o...")
-    processed = []
-    for idx, msg in enumerate(messages, 1):
-        text = msg.get('text', '')
-        if not text:
-            continue
-        summary = process_message_with_openai(msg, client)
-        processed.append({
-            'id': msg.get('id'),
-            'summary': summary
-        })
-        print(f"[{idx}/{len(messages)}] Done")
-    # Ensure output directory exists
-    OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
-    # Create output file name based on input file
-    input_stem = selected_file.stem.replace('raw_dump_', '')
-    output_file = OUTPUTS_DIR / f'notes_{input_stem}.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(processed, f, indent=2, ensure_ascii=False)
-    print(f"\nAll summaries saved to {output_file}")
+    rate_limiter = rate_limiter_from_env()
+    # Opened before the HTTP client, so a cache that cannot be opened leaves
+    # no connection pool behind
+    cache = None if args.no_cache else ResponseCache(args.cache_dir)
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS),
+        timeout=HTTP_TIMEOUT,
+    )
+    client = AsyncOpenAI(api_key=openai_api_key, http_client=http_client)
+    api_slots = asyncio.Semaphore(max(1, args.concurrency))
+    print(f"\nProcessing messages through OpenAI GPT-4o "
+          f"({args.concurrency} concurrent requests)...")
+    try:
+        # Files share the client, rate limiter, cache and request slots, so
+        # the account limits and --concurrency hold across all of them
+        output_files = await asyncio.gather(*(
+            process_file(path, client, rate_limiter, cache, api_slots, args.concurrency, args.batch_size)
+            for path in selected_files
+        ))
+    finally:
+        await http_client.aclose()
+        if cache is not None:
+            print(f"Cache: {cache.hits} hits, {cache.misses} misses")
+            cache.close()
+    for output_file in output_files:
+        if output_file is not None:
+            print(f"\nAll summaries saved to {output_file}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    asyncio.run(main())
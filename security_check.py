@@ -6,8 +6,65 @@ Prevents accidental exposure of API credentials and sensitive data.
 
 import os
 import re
+import mmap
+import bisect
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Iterator, List, Dict, Tuple
+
+# File types scanned for credentials; everything else is treated as binary
+TEXT_SUFFIXES = {'.py', '.md', '.txt', '.env', '.toml', '.yaml', '.yml', '.json'}
+
+# Directories never scanned (hidden directories such as .git are skipped too)
+SKIP_DIRS = {'__pycache__', 'venv', 'node_modules', 'outputs'}
+
+# Patterns for hardcoded API keys
+API_KEY_PATTERNS = [
+    r'TELEGRAM_API_ID\s*=\s*["\']?\d+["\']?',
+    r'TELEGRAM_API_HASH\s*=\s*["\']?[a-f0-9]{32}["\']?',
+    r'OPENAI_API_KEY\s*=\s*["\']?sk-[a-zA-Z0-9]{48}["\']?',
+    r'api_id\s*=\s*["\']?\d+["\']?',
+    r'api_hash\s*=\s*["\']?[a-f0-9]{32}["\']?',
+    r'api_key\s*=\s*["\']?sk-[a-zA-Z0-9]{48}["\']?',
+]
+
+# All patterns combined into one alternation so each file is scanned once;
+# the named group of a match identifies which pattern produced it. Compiled
+# as bytes so files can be scanned in place through mmap without decoding.
+_CRED_RE = re.compile(
+    '|'.join(f'(?P<g{i}>{pattern})' for i, pattern in enumerate(API_KEY_PATTERNS)).encode('ascii'),
+    re.IGNORECASE
+)
+
+
+def _find_credentials(content: bytes) -> List[Dict]:
+    """
+    Scan file contents for hardcoded credentials.
+    
+    Args:
+        content: Raw file bytes (or a memory map of them)
+        
+    Returns:
+        List of hardcoded credential issues
+    """
+    issues = []
+    
+    # Offsets of every newline, so a match's line number is a binary search
+    newline_offsets = []
+    index = content.find(b'\n')
+    while index != -1:
+        newline_offsets.append(index)
+        index = content.find(b'\n', index + 1)
+    
+    for match in _CRED_RE.finditer(content):
+        issues.append({
+            'type': 'hardcoded_credential',
+            'line': bisect.bisect_right(newline_offsets, match.start()) + 1,
+            'match': match.group().decode('utf-8', errors='replace'),
+            'pattern': API_KEY_PATTERNS[int(match.lastgroup[1:])]
+        })
+    
+    return issues
 
 
 def check_for_credentials_in_file(file_path: Path) -> List[Dict]:
@@ -23,34 +80,16 @@ def check_for_credentials_in_file(file_path: Path) -> List[Dict]:
     if not file_path.exists():
         return []
     
+    issues = []
+    
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    issues.extend(_find_credentials(content))
     except Exception:
         return []
     
-    issues = []
-    
-    # Check for hardcoded API keys
-    api_key_patterns = [
-        r'TELEGRAM_API_ID\s*=\s*["\']?\d+["\']?',
-        r'TELEGRAM_API_HASH\s*=\s*["\']?[a-f0-9]{32}["\']?',
-        r'OPENAI_API_KEY\s*=\s*["\']?sk-[a-zA-Z0-9]{48}["\']?',
-        r'api_id\s*=\s*["\']?\d+["\']?',
-        r'api_hash\s*=\s*["\']?[a-f0-9]{32}["\']?',
-        r'api_key\s*=\s*["\']?sk-[a-zA-Z0-9]{48}["\']?',
-    ]
-    
-    for pattern in api_key_patterns:
-        matches = re.finditer(pattern, content, re.IGNORECASE)
-        for match in matches:
-            issues.append({
-                'type': 'hardcoded_credential',
-                'line': content[:match.start()].count('\n') + 1,
-                'match': match.group(),
-                'pattern': pattern
-            })
-    
     # Check for session files
     if file_path.suffix == '.session':
         issues.append({
@@ -63,6 +102,31 @@ def check_for_credentials_in_file(file_path: Path) -> List[Dict]:
     return issues
 
 
+def _iter_text_files(root: Path) -> Iterator[str]:
+    """
+    Walk the project tree and yield text files worth scanning.
+    
+    Args:
+        root: Directory to walk
+        
+    Returns:
+        Iterator of file paths relative to root
+    """
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in sorted(entries, key=lambda e: e.name):
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith('.') and entry.name not in SKIP_DIRS:
+                    pending.append(Path(entry.path))
+            elif entry.is_file() and Path(entry.name).suffix in TEXT_SUFFIXES:
+                yield os.path.relpath(entry.path, root)
+
+
 def check_project_security() -> Tuple[bool, List[Dict]]:
     """
     Perform comprehensive security check on the project.
@@ -73,25 +137,15 @@ def check_project_security() -> Tuple[bool, List[Dict]]:
     project_root = Path('.')
     issues = []
     
-    # Files to check
-    files_to_check = [
-        'cli.py',
-        'parser.py', 
-        'processor.py',
-        'generator.py',
-        'tg_client.py',
-        'run_parser.py',
-        'run_processor.py',
-        'run_generator.py',
-        'requirements.txt',
-        'README.md'
-    ]
-    
-    # Check specific files
-    for file_name in files_to_check:
-        file_path = project_root / file_name
-        if file_path.exists():
-            file_issues = check_for_credentials_in_file(file_path)
+    # Check text files across the tree, scanning them in a thread pool so
+    # file I/O overlaps
+    files_to_check = _iter_text_files(project_root)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = executor.map(
+            lambda file_name: (file_name, check_for_credentials_in_file(project_root / file_name)),
+            files_to_check
+        )
+        for file_name, file_issues in results:
             for issue in file_issues:
                 issue['file'] = file_name
                 issues.append(issue)
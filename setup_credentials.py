@@ -5,7 +5,6 @@ This script safely updates the .env file with your actual credentials.
 """
 
 import os
-import re
 from pathlib import Path
 from typing import Optional
 
@@ -24,33 +23,33 @@ def update_env_file(api_id: str, api_hash: str, openai_key: Optional[str] = None
         print("❌ .env file not found. Please run 'cp config.example.env .env' first.")
         return False
     
+    updates = {
+        'TELEGRAM_API_ID': api_id,
+        'TELEGRAM_API_HASH': api_hash,
+    }
+    if openai_key:
+        updates['OPENAI_API_KEY'] = openai_key
+    
     # Read current .env file
     with open(env_path, 'r') as f:
-        content = f.read()
+        lines = f.read().splitlines()
     
-    # Update Telegram credentials
-    content = re.sub(
-        r'TELEGRAM_API_ID=.*',
-        f'TELEGRAM_API_ID={api_id}',
-        content
-    )
-    content = re.sub(
-        r'TELEGRAM_API_HASH=.*',
-        f'TELEGRAM_API_HASH={api_hash}',
-        content
-    )
+    # Rewrite matching KEY=value lines in a single pass; comments, blank
+    # lines and unrelated keys are passed through untouched
+    written = set()
+    for i, line in enumerate(lines):
+        key, sep, _ = line.partition('=')
+        key = key.strip()
+        if sep and key in updates:
+            lines[i] = f'{key}={updates[key]}'
+            written.add(key)
     
-    # Update OpenAI key if provided
-    if openai_key:
-        content = re.sub(
-            r'OPENAI_API_KEY=.*',
-            f'OPENAI_API_KEY={openai_key}',
-            content
-        )
+    # Append any keys missing from the file
+    lines.extend(f'{key}={value}' for key, value in updates.items() if key not in written)
     
     # Write updated content
     with open(env_path, 'w') as f:
-        f.write(content)
+        f.write('\n'.join(lines) + '\n')
     
     print("✅ Credentials updated in .env file")
     return True
@@ -17,18 +17,63 @@ TODO: Add message filtering options
 """
 
 import os
-import json
 import asyncio
+import itertools
+import logging
 import re
-from typing import List, Dict, Optional
+import sys
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Optional, Union
 from pathlib import Path
-from telethon import TelegramClient
-from telethon.tl.types import Channel, Chat, User
-from telethon.errors import SessionPasswordNeededError, PhoneCodeInvalidError
+from telethon import TelegramClient, utils
+from telethon.tl.functions.messages import GetHistoryRequest
+from telethon.tl.types import Channel, Chat, User, MessageEmpty, TypeInputPeer
+from telethon.errors import SessionPasswordNeededError, PhoneCodeInvalidError, FloodWaitError
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+import jsonio
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Status messages go through logging so library users can silence them;
+# running this module as a script prints them to stdout
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Write buffer for exports, so the streaming writer hands many small
+# per-message chunks to the OS in large write() calls
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Minimum number of seconds between download progress updates
+PROGRESS_INTERVAL = 0.5
+
+# Async callable supplying a login secret (phone number, code or password)
+PromptCallback = Callable[[], Awaitable[str]]
+
+# Whether .env has been loaded; done lazily so importing this module stays cheap
+_ENV_LOADED = False
+
+# Telegram returns at most 100 messages per messages.getHistory call
+HISTORY_PAGE_SIZE = 100
+# Number of getHistory calls kept in flight while downloading
+HISTORY_WORKERS = 4
+# FloodWaitErrors tolerated per history page before the download is given up on
+MAX_FLOOD_RETRIES = 5
+
+
+def _load_env() -> None:
+    """
+    Load environment variables from .env on first use.
+    """
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        load_dotenv()
+        _ENV_LOADED = True
 
 
 def get_telegram_credentials() -> tuple[str, str]:
@@ -41,6 +86,7 @@ def get_telegram_credentials() -> tuple[str, str]:
     Raises:
         ValueError: If credentials are not found
     """
+    _load_env()
     api_id = os.getenv('TELEGRAM_API_ID')
     api_hash = os.getenv('TELEGRAM_API_HASH')
     
@@ -60,16 +106,91 @@ def get_session_name() -> str:
     Returns:
         Session name for Telegram client
     """
+    _load_env()
     return os.getenv('TELEGRAM_SESSION_NAME', 'tg2kb_session')
 
 
-async def connect_telethon(api_id: str, api_hash: str) -> Optional[TelegramClient]:
+async def prompt_input(prompt: str) -> str:
+    """
+    Read a line from stdin without blocking the event loop.
+    
+    Args:
+        prompt: Text shown before reading the answer
+        
+    Returns:
+        The line entered by the user
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, input, prompt)
+
+
+async def _ask_phone() -> str:
+    return await prompt_input("Enter your phone number (with country code, e.g., +1234567890): ")
+
+
+async def _ask_code() -> str:
+    return await prompt_input("Enter the verification code sent to your phone: ")
+
+
+async def _ask_password() -> str:
+    return await prompt_input("Enter your 2FA password: ")
+
+
+async def authorize(
+    client: TelegramClient,
+    phone_cb: PromptCallback,
+    code_cb: PromptCallback,
+    password_cb: PromptCallback
+) -> bool:
+    """
+    Sign a connected client in, asking the callbacks for each secret.
+    
+    Contains no terminal I/O itself, so batch jobs can pass callbacks that
+    read environment variables or a secrets store instead of stdin.
+    
+    Args:
+        client: Connected TelegramClient instance
+        phone_cb: Returns the phone number, with country code
+        code_cb: Returns the verification code sent by Telegram
+        password_cb: Returns the 2FA password; only called if one is set
+        
+    Returns:
+        True if the client is now authorized
+    """
+    phone = await phone_cb()
+    await client.send_code_request(phone)
+    
+    try:
+        await client.sign_in(phone, await code_cb())
+    except PhoneCodeInvalidError:
+        logger.error("Invalid code. Please try again.")
+        return False
+    except SessionPasswordNeededError:
+        await client.sign_in(password=await password_cb())
+    
+    return True
+
+
+async def connect_telethon(
+    api_id: str,
+    api_hash: str,
+    *,
+    phone_cb: Optional[PromptCallback] = None,
+    code_cb: Optional[PromptCallback] = None,
+    password_cb: Optional[PromptCallback] = None
+) -> Optional[TelegramClient]:
     """
     Establish connection to Telegram using Telethon.
     
+    Callbacks are only used for the first login of a session; omitted ones
+    fall back to interactive prompts on stdin.
+    
     Args:
         api_id: Telegram API ID from https://my.telegram.org
         api_hash: Telegram API Hash from https://my.telegram.org
+        phone_cb: Async callable returning the phone number
+        code_cb: Async callable returning the verification code
+        password_cb: Async callable returning the 2FA password
         
     Returns:
         Connected TelegramClient instance
@@ -82,25 +203,21 @@ async def connect_telethon(api_id: str, api_hash: str) -> Optional[TelegramClien
         
         # Check if already authorized
         if not await client.is_user_authorized():
-            print("First time login required. Please follow the prompts:")
-            phone = input("Enter your phone number (with country code, e.g., +1234567890): ")
-            await client.send_code_request(phone)
-            
-            try:
-                code = input("Enter the verification code sent to your phone: ")
-                await client.sign_in(phone, code)
-            except PhoneCodeInvalidError:
-                print("Invalid code. Please try again.")
+            logger.info("First time login required. Please follow the prompts:")
+            authorized = await authorize(
+                client,
+                phone_cb or _ask_phone,
+                code_cb or _ask_code,
+                password_cb or _ask_password
+            )
+            if not authorized:
                 return None
-            except SessionPasswordNeededError:
-                password = input("Enter your 2FA password: ")
-                await client.sign_in(password=password)
         
-        print("✅ Successfully connected to Telegram!")
+        logger.info("✅ Successfully connected to Telegram!")
         return client
         
     except Exception as e:
-        print(f"❌ Failed to connect to Telegram: {e}")
+        logger.error("❌ Failed to connect to Telegram: %s", e)
         return None
 
 
@@ -118,24 +235,29 @@ async def get_user_channels(client: TelegramClient) -> List[Dict]:
     
     try:
         async for dialog in client.iter_dialogs():
-            if isinstance(dialog.entity, (Channel, Chat)) and not isinstance(dialog.entity, User):
+            # TL types are never subclassed, so an identity check on the class
+            # is enough and avoids isinstance() walking the MRO per dialog
+            entity = dialog.entity
+            cls = entity.__class__
+            if cls is Channel or cls is Chat:
                 channel_info = {
-                    'id': dialog.entity.id,
+                    'id': entity.id,
                     'title': dialog.title,
-                    'type': 'channel' if isinstance(dialog.entity, Channel) else 'group',
-                    'participants_count': getattr(dialog.entity, 'participants_count', None)
+                    'type': 'channel' if cls is Channel else 'group',
+                    # Both Channel and Chat define this (None when unknown)
+                    'participants_count': entity.participants_count
                 }
                 channels.append(channel_info)
         
-        print(f"📋 Found {len(channels)} channels/groups")
+        logger.info("📋 Found %d channels/groups", len(channels))
         return channels
         
     except Exception as e:
-        print(f"❌ Error fetching channels: {e}")
+        logger.error("❌ Error fetching channels: %s", e)
         return []
 
 
-def select_channel(channels: List[Dict]) -> Dict:
+async def select_channel(channels: List[Dict]) -> Dict:
     """
     Interactive CLI prompt to select a channel from the list.
     
@@ -150,13 +272,16 @@ def select_channel(channels: List[Dict]) -> Dict:
         return {}
     
     print("\n📺 Available channels:")
+    # get_user_channels() always sets participants_count, possibly to None
+    width = len(str(len(channels)))
     for i, channel in enumerate(channels, 1):
-        participants = channel.get('participants_count', 'N/A')
-        print(f"{i:2d}. {channel['title']} ({channel['type']}, {participants} members)")
+        participants = channel['participants_count'] or 'N/A'
+        print(f"{i:{width}d}. {channel['title']} ({channel['type']}, {participants} members)")
     
     while True:
         try:
-            choice = input(f"\nSelect a channel (1-{len(channels)}): ")
+            # Read off the event loop so the connected client keeps serving pings
+            choice = await prompt_input(f"\nSelect a channel (1-{len(channels)}): ")
             index = int(choice) - 1
             if 0 <= index < len(channels):
                 selected = channels[index]
@@ -168,87 +293,347 @@ def select_channel(channels: List[Dict]) -> Dict:
             print("❌ Please enter a valid number.")
 
 
-async def download_messages(client: TelegramClient, channel_id: int, limit: int = 1000) -> List[Dict]:
+async def _fetch_history_page(
+    client: TelegramClient, peer: TypeInputPeer, offset_id: int, add_offset: int,
+    slots: asyncio.Semaphore
+):
+    """
+    Fetch one page of HISTORY_PAGE_SIZE messages, counted from offset_id.
+    
+    Args:
+        client: Connected TelegramClient instance
+        peer: Resolved input peer of the channel
+        offset_id: Fixed anchor just above the newest message
+        add_offset: Number of messages below the anchor to skip
+        slots: Semaphore bounding the requests in flight
+        
+    Returns:
+        messages.Messages result for the page
+    """
+    for attempt in range(MAX_FLOOD_RETRIES):
+        try:
+            async with slots:
+                return await client(GetHistoryRequest(
+                    peer=peer,
+                    offset_id=offset_id,
+                    offset_date=None,
+                    add_offset=add_offset,
+                    limit=HISTORY_PAGE_SIZE,
+                    max_id=0,
+                    min_id=0,
+                    hash=0
+                ))
+        except FloodWaitError as e:
+            if attempt == MAX_FLOOD_RETRIES - 1:
+                raise
+            logger.info("⏳ Rate limited by Telegram, waiting %d seconds...", e.seconds)
+            await asyncio.sleep(max(e.seconds, 2 ** attempt))
+
+
+async def _iter_history(client: TelegramClient, channel: Union[int, TypeInputPeer], limit: int):
+    """
+    Iterate over a channel's history, newest first, with parallel requests.
+    
+    The newest message ID and the message count are read once. Pages are then
+    addressed by position below that fixed anchor (add_offset = k * page size),
+    so they can be requested HISTORY_WORKERS at a time, and gaps in message IDs
+    (basic groups, deleted posts) cost nothing extra.
+    
+    Args:
+        client: Connected TelegramClient instance
+        channel: Channel ID or an already resolved input peer
+        limit: Maximum number of messages to return
+        
+    Yields:
+        Tuples of (raw Message, entities of its page keyed by peer ID)
+    """
+    # Returns an input peer as-is, so callers that resolved it pay nothing here
+    peer = await client.get_input_entity(channel)
+    latest = await client(GetHistoryRequest(
+        peer=peer, offset_id=0, offset_date=None, add_offset=0,
+        limit=1, max_id=0, min_id=0, hash=0
+    ))
+    if not latest.messages:
+        return
+    # Only sliced results carry a count; a plain one holds the whole history
+    total = min(limit, getattr(latest, 'count', len(latest.messages)))
+    offset_id = latest.messages[0].id + 1
+    page_count = -(-total // HISTORY_PAGE_SIZE)
+    
+    slots = asyncio.Semaphore(HISTORY_WORKERS)
+    pages = (
+        asyncio.ensure_future(_fetch_history_page(client, peer, offset_id, k * HISTORY_PAGE_SIZE, slots))
+        for k in range(page_count)
+    )
+    # Pages are scheduled a little ahead of the one being consumed, so slots
+    # stay busy while the memory held stays bounded
+    pending = deque(itertools.islice(pages, 2 * HISTORY_WORKERS))
+    remaining = total
+    # Deletions during the download shift positions; never go back up in IDs
+    last_id = offset_id
+    try:
+        while pending and remaining > 0:
+            result = await pending.popleft()
+            pending.extend(itertools.islice(pages, 1))
+            entities = {utils.get_peer_id(x): x for x in itertools.chain(result.users, result.chats)}
+            for message in result.messages:
+                if message.id >= last_id or isinstance(message, MessageEmpty):
+                    continue
+                last_id = message.id
+                yield message, entities
+                remaining -= 1
+                if remaining <= 0:
+                    break
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class _ProgressReporter:
+    """
+    Log download progress at most once every PROGRESS_INTERVAL seconds.
+    """
+    
+    def __init__(self, total: int):
+        self.total = total
+        self._last_report = time.monotonic()
+    
+    def update(self, count: int) -> None:
+        now = time.monotonic()
+        if now - self._last_report >= PROGRESS_INTERVAL:
+            logger.info("📥 %d/%d messages scanned", count, self.total)
+            self._last_report = now
+
+
+def _sender_name(sender) -> str:
+    """
+    Get a display name for a message sender.
+    
+    Args:
+        sender: Sender entity of a message (User, Channel or None)
+        
+    Returns:
+        Human-readable sender name
+    """
+    if isinstance(sender, User):
+        sender_name = sender.first_name or ''
+        if sender.last_name:
+            sender_name = f"{sender_name} {sender.last_name}"
+        return sender_name.strip() or 'User'
+    if isinstance(sender, Channel):
+        return sender.title or 'Channel'
+    if sender is None:
+        return 'Unknown'
+    return str(type(sender))
+
+
+async def download_messages(
+    client: TelegramClient, channel: Union[int, TypeInputPeer], limit: int = 1000
+) -> AsyncIterator[Dict]:
     """
     Download messages from the selected channel.
     
+    Messages are yielded as they arrive so callers can write them out
+    without holding the whole channel in memory.
+    
     Args:
         client: Connected TelegramClient instance
-        channel_id: ID of the channel to download from
+        channel: Channel ID, or the input peer from client.get_input_entity()
+            to skip resolving it again
         limit: Maximum number of messages to download
         
-    Returns:
-        List of message dictionaries
+    Yields:
+        Message dictionaries
     """
-    messages = []
+    count = 0
+    scanned = 0
+    progress = _ProgressReporter(limit)
+    # Display names by sender ID; most channels have only a handful of authors
+    sender_names: Dict[Optional[int], str] = {}
     
     try:
-        print(f"📥 Downloading up to {limit} messages...")
-        
-        async for message in client.iter_messages(channel_id, limit=limit):
-            if message.text:  # Only process text messages for now
-                # Robust sender extraction
-                sender = message.sender
-                if isinstance(sender, User):
-                    sender_name = sender.first_name or ''
-                    if sender.last_name:
-                        sender_name = f"{sender_name} {sender.last_name}"
-                    sender_name = sender_name.strip() or 'User'
-                elif isinstance(sender, Channel):
-                    sender_name = sender.title or 'Channel'
-                elif sender is None:
-                    sender_name = 'Unknown'
-                else:
-                    sender_name = str(type(sender))
-
-                message_data = {
-                    'id': message.id,
-                    'type': 'message',
-                    'date': message.date.isoformat(),
-                    'from': sender_name,
-                    'text': message.text,
-                    'media_type': None,
-                    'media_url': None
-                }
-                messages.append(message_data)
+        logger.info("📥 Downloading up to %d messages...", limit)
         
-        print(f"✅ Downloaded {len(messages)} messages")
-        return messages
+        async for message, entities in _iter_history(client, channel, limit):
+            scanned += 1
+            progress.update(scanned)
+            # Only process text messages for now. Check the raw message string
+            # first, so media-only and service messages are dropped before
+            # the formatting entities are rendered
+            if not message.message:
+                continue
+            # Render the text the way Message.text would for this client
+            if client.parse_mode:
+                text = client.parse_mode.unparse(message.message, message.entities)
+            else:
+                text = message.message
+            sender_id = message.sender_id
+            sender_name = sender_names.get(sender_id)
+            if sender_name is None:
+                sender_name = _sender_name(entities.get(sender_id))
+                sender_names[sender_id] = sender_name
+            count += 1
+            yield {
+                'id': message.id,
+                'type': 'message',
+                'date': message.date,  # serialised to ISO 8601 by jsonio
+                'from': sender_name,
+                'text': text,
+                'media_type': None,
+                'media_url': None
+            }
+        
+        logger.info("✅ Downloaded %d messages", count)
         
     except Exception as e:
-        print(f"❌ Error downloading messages: {e}")
-        return []
+        logger.error("❌ Error downloading messages: %s", e)
+        # Let the consumer know the export is incomplete
+        raise
+
+
+def pretty_output() -> bool:
+    """
+    Check whether exports should be pretty-printed for humans.
+    
+    Exports are compact by default; set TG2KB_PRETTY=1 to indent them.
+    
+    Returns:
+        True if TG2KB_PRETTY is set to 1
+    """
+    _load_env()
+    return os.getenv('TG2KB_PRETTY') == '1'
+
+
+def dump_format() -> str:
+    """
+    Get the export format selected with TG2KB_DUMP_FORMAT.
+    
+    MessagePack output is roughly a fifth smaller than compact JSON and
+    faster to load, but it is binary and cannot be read or grepped by hand.
+    
+    Returns:
+        'msgpack' if TG2KB_DUMP_FORMAT=msgpack, otherwise 'json'
+        
+    Raises:
+        RuntimeError: If msgpack is selected but not installed
+    """
+    _load_env()
+    if os.getenv('TG2KB_DUMP_FORMAT', '').lower() != 'msgpack':
+        return 'json'
+    if msgpack is None:
+        raise RuntimeError("TG2KB_DUMP_FORMAT=msgpack but msgpack is not installed; run 'pip install msgpack'")
+    return 'msgpack'
+
+
+def _export_header() -> Dict:
+    """
+    Build the metadata fields written at the top of every export.
+    """
+    return {
+        'name': 'Telegram Channel Export',
+        'type': 'channel',
+        # Taken once per export; jsonio writes it as ISO 8601 with a Z suffix
+        'export_date': datetime.now(timezone.utc).replace(microsecond=0),
+    }
+
+
+def _remove_partial(path: Path) -> None:
+    """
+    Delete a partially written export, ignoring paths that cannot be removed.
+    """
+    try:
+        path.unlink(missing_ok=True)
+    except OSError:
+        pass
 
 
-def save_messages(messages: List[Dict], path: Path) -> None:
+def save_messages(messages: List[Dict], path: Path) -> bool:
     """
-    Save downloaded messages to JSON file.
+    Save downloaded messages to a JSON or MessagePack file.
+    
+    The format follows the file suffix: '.msgpack' writes MessagePack,
+    anything else writes JSON.
     
     Args:
         messages: List of message dictionaries
-        path: Path to save the JSON file
+        path: Path to save the export file
+        
+    Returns:
+        True if the file was written; on failure the partial file is removed
     """
     try:
         # Ensure directory exists
         path.parent.mkdir(parents=True, exist_ok=True)
         
         # Prepare export data
-        export_data = {
-            'name': 'Telegram Channel Export',
-            'type': 'channel',
-            'export_date': '2024-01-01T00:00:00Z',  # TODO: Use actual date
-            'message_count': len(messages),
-            'messages': messages
-        }
+        export_data = _export_header()
+        export_data['message_count'] = len(messages)
+        export_data['messages'] = messages
+        
+        # Serialize in the format chosen by the file suffix
+        if path.suffix == '.msgpack':
+            if msgpack is None:
+                raise RuntimeError("msgpack is not installed; run 'pip install msgpack'")
+            data = msgpack.packb(export_data, use_bin_type=True, datetime=True)
+        else:
+            data = jsonio.dumps(export_data, indent=pretty_output())
         
         # Write to file
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        with open(path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(data)
         
-        print(f"✅ Messages saved to {path}")
+        logger.info("✅ Messages saved to %s", path)
+        return True
         
     except Exception as e:
-        print(f"❌ Error saving messages: {e}")
+        logger.error("❌ Error saving messages: %s", e)
+        _remove_partial(path)
+        return False
+
+
+async def stream_to_json(path: Path, messages: AsyncIterator[Dict]) -> Optional[int]:
+    """
+    Write messages to a JSON export as they arrive.
+    
+    Produces the same document as save_messages(), but encodes one message
+    at a time so the full list is never held in memory. message_count is
+    written after the messages array since it is only known at the end.
+    
+    Args:
+        path: Path to save the JSON file
+        messages: Async iterator of message dictionaries
+        
+    Returns:
+        Number of messages written, or None if the download or the write
+        failed part way (the partial file is removed)
+    """
+    count = 0
+    
+    try:
+        # Ensure directory exists
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        pretty = pretty_output()
+        newline = b'\n' if pretty else b''
+        
+        with open(path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            # Header object with its closing brace replaced by the array opening
+            f.write(jsonio.dumps(_export_header())[:-1] + b',"messages":[' + newline)
+            async for message in messages:
+                if count:
+                    f.write(b',' + newline)
+                f.write(jsonio.dumps(message, indent=pretty))
+                count += 1
+            f.write(newline + b'],"message_count":' + str(count).encode('ascii') + b'}' + newline)
+        
+        logger.info("✅ Messages saved to %s", path)
+        
+    except Exception as e:
+        logger.error("❌ Error saving messages: %s", e)
+        _remove_partial(path)
+        return None
+    
+    return count
 
 
 def sanitize_filename(name: str) -> str:
@@ -272,6 +657,9 @@ async def main():
         api_id, api_hash = get_telegram_credentials()
         print("✅ Credentials loaded")
         
+        # Checked before connecting so a missing msgpack fails straight away
+        export_format = dump_format()
+        
         # Connect to Telegram
         client = await connect_telethon(api_id, api_hash)
         if not client:
@@ -284,23 +672,36 @@ async def main():
             return
         
         # Let user select channel
-        selected_channel = select_channel(channels)
+        selected_channel = await select_channel(channels)
         if not selected_channel:
             return
         
-        # Download messages
-        messages = await download_messages(client, selected_channel['id'], limit=1000)
-        if not messages:
-            print("❌ No messages downloaded")
-            return
-        
-        # Save to file with per-channel filename
+        # Download messages to a file with per-channel filename
         channel_title = selected_channel.get('title') or f"channel_{selected_channel.get('id', 'unknown')}"
         safe_title = sanitize_filename(channel_title)
-        output_path = Path(f'examples/raw_dump_{safe_title}.json')
-        save_messages(messages, output_path)
+        output_path = Path(f'examples/raw_dump_{safe_title}.{export_format}')
+        # Resolve the channel once; the download reuses the input peer for
+        # every history request
+        peer = await client.get_input_entity(selected_channel['id'])
+        messages = download_messages(client, peer, limit=1000)
+        if output_path.suffix == '.msgpack':
+            # MessagePack needs the array length up front, so it cannot be streamed
+            messages = [message async for message in messages]
+            message_count = len(messages)
+            if message_count and not save_messages(messages, output_path):
+                print("❌ Saving failed, no export written")
+                return
+        else:
+            message_count = await stream_to_json(output_path, messages)
+            if message_count is None:
+                print("❌ Download failed, no export written")
+                return
+        if not message_count:
+            output_path.unlink(missing_ok=True)
+            print("❌ No messages downloaded")
+            return
         
-        print(f"\n🎉 Success! Downloaded {len(messages)} messages from '{selected_channel['title']}'")
+        print(f"\n🎉 Success! Downloaded {message_count} messages from '{selected_channel['title']}'")
         print(f"📁 Output saved to: {output_path}")
         
     except Exception as e:
@@ -315,4 +716,16 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    # Only this module's status messages; Telethon's own INFO logs stay quiet
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    # uvloop's libuv-based event loop handles Telethon's socket traffic faster
+    # than the default selector loop; fall back silently when it is missing
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main()) 
\ No newline at end of file